@@ -19,4 +19,34 @@ EXPIRATION_MAX = 21
 OPEN_INTEREST_MIN = 100
 
 # The minimum score passed to core.strategy.select_options().
-SCORE_MIN = 0.05
\ No newline at end of file
+SCORE_MIN = 0.05
+
+# Pre-screen of underlyings on cached daily bars, applied before any option chain is requested.
+# Set PRESCREEN to False to filter by buying power only.  Symbols without enough history are never dropped.
+PRESCREEN = True
+
+# Calendar days of daily bars used for the volatility metrics (also the IV-rank proxy history).
+BAR_LOOKBACK_DAYS = 365
+
+# The range of allowed 20-day annualized realized volatility.
+REALIZED_VOL_MIN = 0.0
+REALIZED_VOL_MAX = 1.5
+
+# The max 14-day average true range as a fraction of price.
+ATR_PCT_MAX = 0.10
+
+# The min position of the price within its 60-day low/high range (0 = at the low, 1 = at the high).
+# Raise it to skip underlyings breaking down through support.
+RANGE_POSITION_MIN = 0.0
+
+# The min rank of current realized volatility within its own history (a proxy for IV rank).
+IV_RANK_MIN = 0.0
+
+# Risk engine (core/risk.py), evaluated on the current positions at the start of every run.
+# Sell assigned shares once the price falls this fraction below the purchase price (None disables).
+# Shares covered by a short call are only flagged, never sold.
+STOP_LOSS_PCT = None
+
+# Skip selling new puts while the worst portfolio loss across the price / volatility shock grid
+# exceeds this many dollars (None disables).
+MAX_SCENARIO_LOSS = None
\ No newline at end of file
@@ -0,0 +1,123 @@
+import logging
+import threading
+import datetime
+from datetime import timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+import numpy as np
+
+logger = logging.getLogger(f"strategy.{__name__}")
+
+BAR_DTYPE = np.dtype([
+    ("date", "M8[D]"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "f8"),
+])
+
+# An overnight move larger than this between cached and new bars is treated as an unadjusted split.
+SPLIT_GAP = 0.4
+# Allowed gap (weekends / holidays) between the requested start and the first cached bar.
+START_TOLERANCE_DAYS = 7
+
+
+def _to_array(bars):
+    """
+    Convert a list of alpaca Bar objects into a BAR_DTYPE array keyed by New York trading date.
+    """
+    timezone = ZoneInfo("America/New_York")
+    arr = np.empty(len(bars), dtype=BAR_DTYPE)
+    for i, b in enumerate(bars):
+        arr[i] = (b.timestamp.astimezone(timezone).date(), b.open, b.high, b.low, b.close, b.volume)
+    return arr
+
+
+class BarCache:
+    """
+    On-disk cache of daily bars, one `<symbol>.npy` file per underlying.
+
+    Each load only requests the bars that are missing since the last cached session, in one
+    bulk request for all stale symbols.  Today's (incomplete) bar is never stored.
+    """
+
+    def __init__(self, cache_dir="data/bars"):
+        self.cache_dir = Path(cache_dir)
+        self._lock = threading.Lock()
+
+    def _path(self, symbol):
+        return self.cache_dir / f"{symbol}.npy"
+
+    def _read(self, symbol):
+        path = self._path(symbol)
+        if not path.exists():
+            return None
+        try:
+            return np.load(path)
+        except (OSError, ValueError):
+            logger.warning(f"Discarding unreadable bar cache for {symbol}")
+            return None
+
+    def _write(self, symbol, arr):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_dir / f"{symbol}.tmp.npy"
+        np.save(tmp, arr)
+        tmp.replace(self._path(symbol))
+
+    def _fetch(self, client, symbols, start, end):
+        """
+        Fetch daily bars for sessions in [start, end).  `end` is inclusive on the API side, so the
+        bar stamped on `end` (today's incomplete session) is dropped before it can be cached.
+        """
+        if not symbols:
+            return {}
+        logger.debug(f"Fetching daily bars for {len(symbols)} symbols since {start}")
+        timezone = ZoneInfo("America/New_York")
+        data = client.get_stock_daily_bars(
+            symbols,
+            datetime.datetime.combine(start, datetime.time(), timezone),
+            datetime.datetime.combine(end, datetime.time(), timezone),
+        )
+        end64 = np.datetime64(end, "D")
+        arrays = {s: _to_array(data.get(s, [])) for s in symbols}
+        return {s: arr[arr["date"] < end64] for s, arr in arrays.items()}
+
+    def load(self, client, symbols, lookback_days):
+        """
+        Return a dict of symbol -> BAR_DTYPE array covering the last `lookback_days` calendar days.
+        """
+        today = datetime.datetime.now(ZoneInfo("America/New_York")).date()
+        start = today - timedelta(days=lookback_days)
+        start64 = np.datetime64(start, "D")
+        # Most recent completed weekday session; holidays just cost one empty request.
+        last_session = np.busday_offset(np.datetime64(today, "D"), -1, roll="forward")
+
+        with self._lock:
+            cached = {s: self._read(s) for s in symbols}
+            full, stale = [], []
+            for s, arr in cached.items():
+                if arr is None or len(arr) == 0 or arr["date"][0] > start64 + START_TOLERANCE_DAYS:
+                    full.append(s)
+                elif arr["date"][-1] < last_session:
+                    stale.append(s)
+
+            fetched = self._fetch(client, full, start, today)
+
+            if stale:
+                since = min(cached[s]["date"][-1] for s in stale).astype(datetime.date) + timedelta(days=1)
+                resplit = []
+                for s, new in self._fetch(client, stale, since, today).items():
+                    old = cached[s]
+                    new = new[new["date"] > old["date"][-1]]
+                    if len(new) and abs(new["open"][0] / old["close"][-1] - 1) > SPLIT_GAP:
+                        resplit.append(s)
+                    else:
+                        fetched[s] = np.concatenate([old, new])
+                fetched.update(self._fetch(client, resplit, start, today))
+
+            for s, arr in fetched.items():
+                self._write(s, arr)
+                cached[s] = arr
+
+        return {s: arr[arr["date"] >= start64] for s, arr in cached.items() if arr is not None}
@@ -1,33 +1,46 @@
 from config.params import EXPIRATION_MIN, EXPIRATION_MAX
 from .user_agent_mixin import UserAgentMixin 
+from .http_transport import TransportMixin
+from .bar_cache import BarCache
 from alpaca.trading.client import TradingClient
 from alpaca.data.historical.option import OptionHistoricalDataClient
 from alpaca.data.historical.stock import StockHistoricalDataClient, StockLatestTradeRequest
-from alpaca.data.requests import OptionSnapshotRequest
-from alpaca.trading.requests import GetOptionContractsRequest, MarketOrderRequest
-from alpaca.trading.enums import ContractType, AssetStatus, AssetClass
+from alpaca.data.requests import OptionSnapshotRequest, StockBarsRequest
+from alpaca.data.timeframe import TimeFrame
+from alpaca.data.enums import Adjustment
+from alpaca.trading.requests import GetOptionContractsRequest, MarketOrderRequest, GetOrdersRequest
+from alpaca.trading.enums import ContractType, AssetStatus, AssetClass, OrderSide, QueryOrderStatus
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from zoneinfo import ZoneInfo
 import datetime
 
 
-class TradingClientSigned(UserAgentMixin, TradingClient):
+class TradingClientSigned(UserAgentMixin, TransportMixin, TradingClient):
     pass
 
 
-class StockHistoricalDataClientSigned(UserAgentMixin, StockHistoricalDataClient):
+class StockHistoricalDataClientSigned(UserAgentMixin, TransportMixin, StockHistoricalDataClient):
     pass
 
 
-class OptionHistoricalDataClientSigned(UserAgentMixin, OptionHistoricalDataClient):
+class OptionHistoricalDataClientSigned(UserAgentMixin, TransportMixin, OptionHistoricalDataClient):
     pass
 
 
 class BrokerClient:
-    def __init__(self, api_key, secret_key, paper=True):
-        self.trade_client = TradingClientSigned(api_key=api_key, secret_key=secret_key, paper=paper)
-        self.stock_client = StockHistoricalDataClientSigned(api_key=api_key, secret_key=secret_key)
-        self.option_client = OptionHistoricalDataClientSigned(api_key=api_key, secret_key=secret_key)
+    def __init__(self, api_key, secret_key, paper=True, market_data=None, transport=None):
+        """
+        `market_data` is an optional shared `MarketDataCache`; when given, quotes, chains and
+        snapshots are served from it instead of this account's own data clients.
+        `transport` is an optional shared `HTTPTransport` used by all three Alpaca clients.
+        """
+        self.trade_client = TradingClientSigned(api_key=api_key, secret_key=secret_key, paper=paper, transport=transport)
+        self.stock_client = StockHistoricalDataClientSigned(api_key=api_key, secret_key=secret_key, transport=transport)
+        self.option_client = OptionHistoricalDataClientSigned(api_key=api_key, secret_key=secret_key, transport=transport)
+        self.market_data = market_data
+        self.transport = transport
+        self.bar_cache = BarCache()
 
     def get_positions(self):
         return self.trade_client.get_all_positions()
@@ -41,31 +54,68 @@ class BrokerClient:
         )
         return self.trade_client.submit_order(req)
 
+    def get_open_sell_symbols(self, symbols):
+        """
+        Return the set of `symbols` that already have an open sell order.
+        """
+        req = GetOrdersRequest(status=QueryOrderStatus.OPEN, side=OrderSide.SELL, symbols=list(symbols))
+        return {o.symbol for o in self.trade_client.get_orders(req)}
+
     def get_option_snapshot(self, symbol):
+        if self.market_data:
+            return self.market_data.get_option_snapshot(symbol)
+
         if isinstance(symbol, str):
             req = OptionSnapshotRequest(symbol_or_symbols=symbol)
             return self.option_client.get_option_snapshot(req)
 
         elif isinstance(symbol, list):
+            batches = [symbol[i:i+100] for i in range(0, len(symbol), 100)]
+            fetch = lambda batch: self.option_client.get_option_snapshot(OptionSnapshotRequest(symbol_or_symbols=batch))
             all_results = {}
-            for i in range(0, len(symbol), 100):
-                batch = symbol[i:i+100]
-                req = OptionSnapshotRequest(symbol_or_symbols=batch)
-                result = self.option_client.get_option_snapshot(req)
-                all_results.update(result)
+            if self.transport and len(batches) > 1:
+                # Batches go out concurrently over the shared keep-alive pool
+                with ThreadPoolExecutor(max_workers=min(self.transport.pool_size, len(batches))) as pool:
+                    for result in pool.map(fetch, batches):
+                        all_results.update(result)
+            else:
+                for batch in batches:
+                    all_results.update(fetch(batch))
             return all_results
         else:
             raise ValueError("Symbol must be a string or list of symbols.")
 
     def get_stock_latest_trade(self, symbol):
+        if self.market_data:
+            return self.market_data.get_stock_latest_trade(symbol)
         req = StockLatestTradeRequest(symbol_or_symbols=symbol)
         return self.stock_client.get_stock_latest_trade(req)
 
-    def get_options_contracts(self, underlying_symbols, contract_type=None):
+    def get_stock_daily_bars(self, symbols, start, end):
+        """
+        Return split-adjusted daily bars for `symbols` between `start` and `end` as a dict of symbol -> list of Bar.
+        """
+        req = StockBarsRequest(
+            symbol_or_symbols=symbols, timeframe=TimeFrame.Day, start=start, end=end, adjustment=Adjustment.SPLIT
+        )
+        return self.stock_client.get_stock_bars(req).data
+
+    def get_daily_bars(self, symbols, lookback_days):
+        """
+        Return daily bars for `symbols` over the last `lookback_days`, served from the on-disk bar cache.
+        """
+        if self.market_data:
+            return self.market_data.get_daily_bars(symbols, lookback_days)
+        return self.bar_cache.load(self, symbols, lookback_days)
+
+    def get_options_contracts(self, underlying_symbols, contract_type=None, min_dte=EXPIRATION_MIN, max_dte=EXPIRATION_MAX):
+        if self.market_data:
+            return self.market_data.get_options_contracts(underlying_symbols, contract_type, min_dte, max_dte)
+
         timezone = ZoneInfo("America/New_York")
         today = datetime.datetime.now(timezone).date()
-        min_expiration = today + timedelta(days=EXPIRATION_MIN)
-        max_expiration = today + timedelta(days=EXPIRATION_MAX)
+        min_expiration = today + timedelta(days=min_dte)
+        max_expiration = today + timedelta(days=max_dte)
 
         contract_type = {'put': ContractType.PUT, 'call': ContractType.CALL}.get(contract_type, None)
 
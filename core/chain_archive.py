@@ -0,0 +1,152 @@
+import logging
+import threading
+import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+import numpy as np
+
+logger = logging.getLogger(f"strategy.{__name__}")
+
+# Compact fixed-width row layout: quotes and greeks fit float32, so a row is ~100 bytes.
+CHAIN_DTYPE = np.dtype([
+    ("recorded_at", "M8[s]"),
+    ("underlying", "S8"),
+    ("symbol", "S24"),
+    ("contract_type", "S1"),
+    ("expiration", "M8[D]"),
+    ("dte", "i2"),
+    ("strike", "f8"),
+    ("open_interest", "f4"),
+    ("bid", "f4"),
+    ("ask", "f4"),
+    ("bid_size", "f4"),
+    ("ask_size", "f4"),
+    ("last", "f4"),
+    ("iv", "f4"),
+    ("delta", "f4"),
+    ("gamma", "f4"),
+    ("theta", "f4"),
+    ("vega", "f4"),
+    ("rho", "f4"),
+])
+
+
+def _num(value):
+    return float(value) if value is not None else np.nan
+
+
+class ChainArchive:
+    """
+    Date-partitioned archive of raw option chains, stored as memory-mappable `.npy` files.
+
+    Every run appends one file, `<root>/<YYYY-MM-DD>/<HHMMSS_ffffff>.npy`, holding each contract
+    seen in the run with its snapshot quote and greeks.  Rows are sorted by underlying, so
+    `query(underlying=...)` returns views straight into the memory-mapped files.
+    """
+
+    def __init__(self, root="data/chains"):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._rows = {}
+
+    def record(self, contracts, snapshots):
+        """
+        Buffer contracts and their snapshots for the next `flush`.  A contract already recorded in
+        this run (e.g. by another account) is kept once.
+        """
+        timezone = ZoneInfo("America/New_York")
+        now = datetime.datetime.now(timezone)
+        today = now.date()
+        recorded_at = np.datetime64(now.replace(tzinfo=None), "s")
+        with self._lock:
+            for c in contracts:
+                if c.symbol in self._rows:
+                    continue
+                snap = snapshots.get(c.symbol)
+                greeks = getattr(snap, 'greeks', None)
+                quote = getattr(snap, 'latest_quote', None)
+                trade = getattr(snap, 'latest_trade', None)
+                self._rows[c.symbol] = (
+                    recorded_at,
+                    c.underlying_symbol,
+                    c.symbol,
+                    c.type.title()[0],
+                    c.expiration_date,
+                    (c.expiration_date - today).days,
+                    c.strike_price,
+                    _num(c.open_interest),
+                    _num(quote.bid_price) if quote else np.nan,
+                    _num(quote.ask_price) if quote else np.nan,
+                    _num(quote.bid_size) if quote else np.nan,
+                    _num(quote.ask_size) if quote else np.nan,
+                    _num(trade.price) if trade else np.nan,
+                    _num(getattr(snap, 'implied_volatility', None)),
+                    _num(greeks.delta) if greeks else np.nan,
+                    _num(greeks.gamma) if greeks else np.nan,
+                    _num(greeks.theta) if greeks else np.nan,
+                    _num(greeks.vega) if greeks else np.nan,
+                    _num(greeks.rho) if greeks else np.nan,
+                )
+
+    def flush(self):
+        """
+        Write the buffered rows to today's partition and return the file path (None if nothing was recorded).
+        """
+        with self._lock:
+            if not self._rows:
+                return None
+            arr = np.array(list(self._rows.values()), dtype=CHAIN_DTYPE)
+            self._rows = {}
+
+        arr.sort(order=["underlying", "expiration", "strike"])
+        now = datetime.datetime.now(ZoneInfo("America/New_York"))
+        partition = self.root / now.strftime("%Y-%m-%d")
+        partition.mkdir(parents=True, exist_ok=True)
+        path = partition / f"{now.strftime('%H%M%S_%f')}.npy"
+        np.save(path, arr)
+        logger.info(f"Archived {len(arr)} option contracts to {path}")
+        return path
+
+    def files(self, start=None, end=None):
+        """
+        List the archive files whose partition date lies in [start, end] (dates or ISO strings).
+        """
+        start = str(start) if start else None
+        end = str(end) if end else None
+        paths = []
+        for partition in sorted(p for p in self.root.glob("*") if p.is_dir()):
+            if (start and partition.name < start) or (end and partition.name > end):
+                continue
+            paths.extend(sorted(partition.glob("*.npy")))
+        return paths
+
+    def scan(self, underlying=None, start=None, end=None, dte_min=None, dte_max=None):
+        """
+        Yield one array per archived run matching the query, memory-mapped from disk.
+
+        Selecting by underlying slices the sorted file without copying; a DTE filter copies only
+        the matching rows.
+        """
+        key = underlying.encode() if underlying else None
+        for path in self.files(start, end):
+            arr = np.load(path, mmap_mode="r")
+            if key is not None:
+                lo = np.searchsorted(arr["underlying"], key, side="left")
+                hi = np.searchsorted(arr["underlying"], key, side="right")
+                arr = arr[lo:hi]
+            if dte_min is not None or dte_max is not None:
+                mask = np.ones(len(arr), dtype=bool)
+                if dte_min is not None:
+                    mask &= arr["dte"] >= dte_min
+                if dte_max is not None:
+                    mask &= arr["dte"] <= dte_max
+                arr = arr[mask]
+            if len(arr):
+                yield arr
+
+    def query(self, underlying=None, start=None, end=None, dte_min=None, dte_max=None):
+        """
+        Return all rows matching the query as a single array.
+        """
+        parts = list(self.scan(underlying, start, end, dte_min, dte_max))
+        return np.concatenate(parts) if parts else np.empty(0, dtype=CHAIN_DTYPE)
@@ -1,4 +1,11 @@
 import argparse
+from .http_transport import DEFAULT_POOL_SIZE
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
 
 def parse_args():
     parser = argparse.ArgumentParser()
@@ -27,5 +34,42 @@ def parse_args():
         action="store_true",
         help="Write logs to file instead of just printing to stdout"
     )
+
+    parser.add_argument(
+        "--accounts",
+        metavar="PATH",
+        help="Run every account in this JSON file concurrently, sharing one market-data pass"
+    )
+
+    parser.add_argument(
+        "--http-pool-size",
+        type=positive_int,
+        default=DEFAULT_POOL_SIZE,
+        help="Keep-alive connections per API host shared by all clients (also caps concurrent fetches)"
+    )
+
+    parser.add_argument(
+        "--risk-watch",
+        type=positive_int,
+        metavar="SECONDS",
+        help="Instead of trading, re-check portfolio risk and stop-losses every SECONDS while the market is open"
+    )
+
+    parser.add_argument(
+        "--export-to",
+        action="append",
+        metavar="SINK",
+        help="Export trades and run summaries through the durable outbox to SINK: "
+             "webhook[:URL], file:PATH or sqlite:PATH (repeatable)"
+    )
+
+    parser.add_argument(
+        "--record-chains",
+        action="store_true",
+        help="Archive every fetched put chain (contracts, quotes and greeks) under data/chains"
+    )
     
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.risk_watch is not None and args.accounts:
+        parser.error("--risk-watch runs for a single account and cannot be combined with --accounts")
+    return args
@@ -2,15 +2,18 @@ import logging
 from .strategy import filter_underlying, filter_options, score_options, select_options
 from .logger import log_trades  # JSON logging helper
 from models.contract import Contract
+from config import params as default_params
 import numpy as np
 from datetime import datetime, date
 from alpaca.common.exceptions import APIError
 
 logger = logging.getLogger(f"strategy.{__name__}")
 
-def sell_puts(client, allowed_symbols, buying_power, strat_logger=None):
+def sell_puts(client, allowed_symbols, buying_power, strat_logger=None, params=default_params, log_dir="logs",
+              chain_archive=None):
     """
     Scan allowed symbols and sell short puts up to the buying power limit.
+    If a `ChainArchive` is given, the full put chain with its snapshots is recorded to it.
     """
     trades = []
     try:
@@ -18,7 +21,7 @@ def sell_puts(client, allowed_symbols, buying_power, strat_logger=None):
             return
 
         logger.info("Searching for put options...")
-        filtered_symbols = filter_underlying(client, allowed_symbols, buying_power)
+        filtered_symbols = filter_underlying(client, allowed_symbols, buying_power, params)
         if strat_logger:
             strat_logger.set_filtered_symbols(filtered_symbols)
 
@@ -27,20 +30,28 @@ def sell_puts(client, allowed_symbols, buying_power, strat_logger=None):
             return
 
         # Fetch and filter put options
-        option_contracts = client.get_options_contracts(filtered_symbols, 'put')
+        option_contracts = client.get_options_contracts(
+            filtered_symbols, 'put', params.EXPIRATION_MIN, params.EXPIRATION_MAX
+        )
         snapshots = client.get_option_snapshot([c.symbol for c in option_contracts])
+        if chain_archive:
+            # Recording is opt-in bookkeeping and must not stop put selling
+            try:
+                chain_archive.record(option_contracts, snapshots)
+            except Exception as exc:
+                logger.exception(f"Failed to record option chain: {exc}")
         put_options = filter_options([
             Contract.from_contract_snapshot(contract, snapshots.get(contract.symbol, None))
             for contract in option_contracts
             if snapshots.get(contract.symbol, None)
-        ])
+        ], params=params)
         if strat_logger:
             strat_logger.log_put_options([p.to_dict() for p in put_options])
 
         if put_options:
             logger.info("Scoring put options...")
             scores = score_options(put_options)
-            selected = select_options(put_options, scores)
+            selected = select_options(put_options, scores, params=params)
 
             for p in selected:
                 cost = 100 * p.strike
@@ -85,10 +96,10 @@ def sell_puts(client, allowed_symbols, buying_power, strat_logger=None):
         logger.exception(f"Error in sell_puts: {exc}")
     finally:
         if trades:
-            log_trades(trades)
+            log_trades(trades, log_dir)
 
 
-def sell_calls(client, symbol, purchase_price, stock_qty, strat_logger=None):
+def sell_calls(client, symbol, purchase_price, stock_qty, strat_logger=None, params=default_params, log_dir="logs"):
     """
     Select and sell covered calls.
     """
@@ -105,8 +116,10 @@ def sell_calls(client, symbol, purchase_price, stock_qty, strat_logger=None):
         logger.info(f"Searching for call options on {symbol}...")
         call_options = filter_options([
             Contract.from_contract(option, client)
-            for option in client.get_options_contracts([symbol], 'call')
-        ], purchase_price)
+            for option in client.get_options_contracts(
+                [symbol], 'call', params.EXPIRATION_MIN, params.EXPIRATION_MAX
+            )
+        ], purchase_price, params)
         if strat_logger:
             strat_logger.log_call_options([c.to_dict() for c in call_options])
 
@@ -151,4 +164,55 @@ def sell_calls(client, symbol, purchase_price, stock_qty, strat_logger=None):
         logger.exception(f"Error in sell_calls: {exc}")
     finally:
         if trades:
-            log_trades(trades)
+            log_trades(trades, log_dir)
+
+
+def close_stop_losses(client, symbols, states, log_dir="logs"):
+    """
+    Market-sell assigned shares that hit the stop-loss rule and return the symbols that were closed.
+    Shares covered by a short call are left alone, since selling them would leave the call naked,
+    and shares that already have an open sell order (e.g. from the previous risk check) are not sold again.
+    """
+    trades = []
+    closed = []
+    if not symbols:
+        return closed
+    try:
+        pending = client.get_open_sell_symbols(symbols)
+    except Exception as exc:
+        # Without the open orders a stop could be sold twice; leave it to the next check
+        logger.exception(f"Could not fetch open orders, skipping stop-losses: {exc}")
+        return closed
+
+    try:
+        for symbol in symbols:
+            state = states.get(symbol, {})
+            if state.get("type") != "long_shares":
+                logger.warning(f"Stop-loss hit on {symbol}, but shares are covered by a short call; not selling.")
+                continue
+            if symbol in pending:
+                logger.info(f"Stop-loss hit on {symbol}, but a sell order is already open; not selling again.")
+                closed.append(symbol)
+                continue
+
+            logger.info(f"Stop-loss hit: selling {state['qty']} shares of {symbol}")
+            try:
+                order = client.market_sell(symbol, state["qty"])
+            except Exception as exc:
+                # One rejected order must not keep the other stops from being sold
+                logger.exception(f"Stop-loss sell of {symbol} failed: {exc}")
+                continue
+            closed.append(symbol)
+            trades.append({
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "ticker": symbol,
+                "type": "STOCK",
+                "qty": state["qty"],
+                "purchase_price": state["price"],
+                "action": "SELL_TO_CLOSE",
+                "status": getattr(order, 'status', 'UNKNOWN')
+            })
+    finally:
+        if trades:
+            log_trades(trades, log_dir)
+    return closed
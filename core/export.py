@@ -0,0 +1,275 @@
+import os
+import json
+import time
+import uuid
+import random
+import sqlite3
+import logging
+import hashlib
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+import requests
+
+logger = logging.getLogger(f"strategy.{__name__}")
+
+
+class ExportError(Exception):
+    pass
+
+
+def sink_key(name, target):
+    """
+    Stable outbox id for one destination: the sink type plus a short hash of its target,
+    so two sinks of the same type never share rows and secret URLs are not stored in the outbox.
+    """
+    return f"{name}:{hashlib.sha256(str(target).encode()).hexdigest()[:12]}"
+
+
+class WebhookSink:
+    """
+    POST batches as a JSON array of records to an HTTP endpoint (e.g. a Google Apps Script URL).
+
+    Every record carries its `export_id`, and the batch is sent with an `Idempotency-Key` header,
+    so a receiver can drop records it has already seen when a batch is retried.  By default only
+    trades are sent, matching what the old workflow POSTed.
+    """
+    name = "webhook"
+
+    def __init__(self, url, kinds=("trade",), timeout=10, session=None):
+        self.url = url
+        self.key = sink_key(self.name, url)
+        self.kinds = kinds
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def send(self, batch):
+        body = [dict(item["record"], export_id=item["id"]) for item in batch]
+        key = hashlib.sha256(",".join(item["id"] for item in batch).encode()).hexdigest()
+        try:
+            resp = self.session.post(
+                self.url, json=body, headers={"Idempotency-Key": key}, timeout=self.timeout, allow_redirects=False
+            )
+        except requests.RequestException as exc:
+            raise ExportError(str(exc)) from exc
+        # Apps Script answers a processed POST with a redirect to its output
+        if resp.status_code >= 400:
+            raise ExportError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+
+
+class FileSink:
+    """
+    Append batches to a JSON-lines file, one {"id", "kind", "record"} object per line.
+    """
+    name = "file"
+
+    def __init__(self, path, kinds=None):
+        self.path = Path(path)
+        self.key = sink_key(self.name, self.path.resolve())
+        self.kinds = kinds
+
+    def send(self, batch):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            for item in batch:
+                f.write(json.dumps(item) + "\n")
+
+
+class SQLiteSink:
+    """
+    Insert batches into an `exports` table; records already exported (same id) are ignored.
+    """
+    name = "sqlite"
+
+    def __init__(self, path, kinds=None):
+        self.path = Path(path)
+        self.key = sink_key(self.name, self.path.resolve())
+        self.kinds = kinds
+
+    def send(self, batch):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS exports (id TEXT PRIMARY KEY, kind TEXT, record TEXT, exported_at REAL)"
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO exports VALUES (?, ?, ?, ?)",
+                    [(item["id"], item["kind"], json.dumps(item["record"]), time.time()) for item in batch],
+                )
+        finally:
+            conn.close()
+
+
+def make_sink(spec):
+    """
+    Build a sink from a CLI spec: `webhook[:URL]`, `file:PATH` or `sqlite:PATH`.
+    A bare `webhook` posts to $EXPORT_WEBHOOK_URL, falling back to $GOOGLE_SCRIPT_URL.
+    """
+    kind, _, target = spec.partition(":")
+    if kind == "webhook":
+        url = target or os.getenv("EXPORT_WEBHOOK_URL") or os.getenv("GOOGLE_SCRIPT_URL")
+        if not url:
+            raise ValueError("Webhook sink needs a URL or EXPORT_WEBHOOK_URL / GOOGLE_SCRIPT_URL set.")
+        return WebhookSink(url)
+    if kind == "file" and target:
+        return FileSink(target)
+    if kind == "sqlite" and target:
+        return SQLiteSink(target)
+    raise ValueError(f"Unknown export sink: {spec}")
+
+
+class Exporter:
+    """
+    Durable outbox for trade and run-summary records.
+
+    `enqueue` is a local SQLite insert, so the trading run never waits on the network.  A
+    background thread sends due records to every sink in batches; failed batches are retried
+    with exponential backoff and stay in the outbox across runs until they are delivered.
+    Outbox rows are keyed by each sink's `key`, so they only ever go to the destination they
+    were queued for.
+    """
+
+    def __init__(self, sinks, path="data/outbox.sqlite", batch_size=50, interval=2.0,
+                 base_delay=2.0, max_delay=600.0):
+        self.sinks = {}
+        for s in sinks:
+            if s.key in self.sinks:
+                raise ValueError(f"Duplicate export sink: {s.name} {s.key}")
+            self.sinks[s.key] = s
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                "id TEXT, sink TEXT, kind TEXT, payload TEXT, created REAL, "
+                "attempts INTEGER DEFAULT 0, next_attempt REAL, last_error TEXT, "
+                "PRIMARY KEY (id, sink))"
+            )
+            # Older outboxes keyed rows by sink type; hand them to the one sink of that type, if unambiguous
+            for name in {s.name for s in sinks}:
+                matching = [key for key, s in self.sinks.items() if s.name == name]
+                if len(matching) == 1:
+                    conn.execute("UPDATE OR IGNORE outbox SET sink = ? WHERE sink = ?", (matching[0], name))
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, kind, record):
+        """
+        Store `record` for delivery to every sink that accepts `kind`; returns its export id.
+        """
+        record_id = uuid.uuid4().hex
+        now = time.time()
+        rows = [
+            (record_id, key, kind, json.dumps(record, default=str), now, now)
+            for key, sink in self.sinks.items()
+            if sink.kinds is None or kind in sink.kinds
+        ]
+        if rows:
+            with self._lock, self._connect() as conn:
+                conn.executemany(
+                    "INSERT INTO outbox (id, sink, kind, payload, created, next_attempt) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        return record_id
+
+    def pending(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def _send_batch(self, key, sink):
+        """
+        Send one batch of due records to a sink.  Returns the number of records delivered.
+        """
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, kind, payload, attempts FROM outbox WHERE sink = ? AND next_attempt <= ? "
+                "ORDER BY created LIMIT ?",
+                (key, time.time(), self.batch_size),
+            ).fetchall()
+        if not rows:
+            return 0
+
+        batch = [{"id": r[0], "kind": r[1], "record": json.loads(r[2])} for r in rows]
+        try:
+            sink.send(batch)
+        except Exception as exc:
+            attempts = max(r[3] for r in rows) + 1
+            delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+            logger.warning(f"Export of {len(rows)} records to {key} failed (attempt {attempts}): {exc}")
+            with self._lock, self._connect() as conn:
+                conn.executemany(
+                    "UPDATE outbox SET attempts = ?, next_attempt = ?, last_error = ? WHERE id = ? AND sink = ?",
+                    [(attempts, time.time() + delay, str(exc)[:500], r[0], key) for r in rows],
+                )
+            return 0
+
+        with self._lock, self._connect() as conn:
+            conn.executemany("DELETE FROM outbox WHERE id = ? AND sink = ?", [(r[0], key) for r in rows])
+        logger.debug(f"Exported {len(rows)} records to {key}")
+        return len(rows)
+
+    def flush(self, deadline=None, stop=None):
+        """
+        Send due records until none are left, every sink fails, `deadline` (time.time()) passes,
+        or the `stop` event is set.  Both limits are checked between batches.
+        """
+        def expired():
+            return (deadline is not None and time.time() >= deadline) or (stop is not None and stop.is_set())
+
+        with self._flush_lock:
+            while not expired():
+                sent = 0
+                for key, sink in self.sinks.items():
+                    if expired():
+                        return
+                    sent += self._send_batch(key, sink)
+                if not sent:
+                    break
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush(stop=self._stop)
+            except Exception as exc:
+                logger.exception(f"Export flush failed: {exc}")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="exporter", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self, timeout=15.0):
+        """
+        Stop the background sender and make a last delivery attempt within `timeout` seconds
+        (a batch already in flight may overrun it by at most the sink's own request timeout).
+        Undelivered records stay in the outbox for the next run.
+        """
+        deadline = time.time() + timeout
+        self._stop.set()
+        if self._thread:
+            self._thread.join(max(deadline - time.time(), 0))
+        if self._flush_lock.acquire(timeout=max(deadline - time.time(), 0)):
+            self._flush_lock.release()
+            self.flush(deadline=deadline)
+        left = self.pending()
+        if left:
+            logger.warning(f"{left} export records left in {self.path} for the next run")
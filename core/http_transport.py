@@ -0,0 +1,73 @@
+import logging
+from requests import Session
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(f"strategy.{__name__}")
+
+# Default number of keep-alive connections kept open per host (and max concurrent fetches).
+DEFAULT_POOL_SIZE = 10
+# Number of per-host pools to keep; the Alpaca clients only talk to a couple of hosts.
+DEFAULT_POOL_HOSTS = 4
+
+
+class HTTPTransport:
+    """
+    One pooled `requests.Session` shared by the trading, stock and option data clients.
+
+    Connections are kept alive per host, so requests from any client (or any account) reuse
+    the same TLS connections instead of opening a session each.  `pool_size` caps the open
+    connections per host; with `pool_block` set, extra concurrent requests wait for a free
+    connection instead of opening throwaway sockets.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, pool_hosts=DEFAULT_POOL_HOSTS, pool_block=True):
+        if pool_size < 1 or pool_hosts < 1:
+            # An empty blocking pool would hang the first request forever
+            raise ValueError(f"pool_size and pool_hosts must be at least 1, got {pool_size} and {pool_hosts}")
+        self.pool_size = pool_size
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_hosts, pool_maxsize=pool_size, pool_block=pool_block
+        )
+        self.session = Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        self.session.headers["Connection"] = "keep-alive"
+
+    def stats(self):
+        """
+        Return per-host connection reuse counters: connections opened, requests sent, and reused.
+        """
+        pools = self.adapter.poolmanager.pools
+        stats = {}
+        for key in pools.keys():
+            pool = pools[key]
+            if pool is None:
+                continue
+            host = f"{key.key_scheme}://{key.key_host}"
+            stats[host] = {
+                "connections": pool.num_connections,
+                "requests": pool.num_requests,
+                "reused": max(pool.num_requests - pool.num_connections, 0),
+            }
+        return stats
+
+    def log_stats(self):
+        for host, s in self.stats().items():
+            logger.debug(
+                f"{host}: {s['requests']} requests over {s['connections']} connections ({s['reused']} reused)"
+            )
+
+    def close(self):
+        self.session.close()
+
+
+class TransportMixin:
+    """
+    Lets an alpaca-py REST client send its requests through a shared `HTTPTransport`.
+    """
+    def __init__(self, *args, transport=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if transport is not None:
+            self._session.close()
+            self._session = transport.session
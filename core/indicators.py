@@ -0,0 +1,73 @@
+import warnings
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+TRADING_DAYS = 252
+RV_WINDOW = 20
+ATR_WINDOW = 14
+RANGE_WINDOW = 60
+
+
+def _align(symbols, bars, field, length):
+    """
+    Stack the last `length` values of `field` for each symbol into a (symbols x length) matrix,
+    right-aligned on the latest bar and left-padded with NaN for short histories.
+    """
+    out = np.full((len(symbols), length), np.nan)
+    for i, s in enumerate(symbols):
+        arr = bars.get(s)
+        if arr is None or len(arr) == 0:
+            continue
+        values = arr[field][-length:]
+        out[i, length - len(values):] = values
+    return out
+
+
+def underlying_metrics(symbols, bars):
+    """
+    Compute volatility and range metrics for all symbols at once from their daily bars.
+
+    Returns a dict of arrays aligned with `symbols`:
+        realized_vol   - annualized 20-day close-to-close volatility
+        atr_pct        - 14-day average true range as a fraction of the last close
+        range_position - where the last close sits in its 60-day low/high range (0 = at the low)
+        support_dist   - distance of the last close above its 60-day low
+        iv_rank        - rank of today's realized vol within its own history (an IV-rank proxy)
+    Symbols without enough history get NaN.
+    """
+    length = max([len(bars[s]) for s in symbols if s in bars] + [RANGE_WINDOW, RV_WINDOW + 2])
+
+    close = _align(symbols, bars, "close", length)
+    high = _align(symbols, bars, "high", length)
+    low = _align(symbols, bars, "low", length)
+    last = close[:, -1]
+
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+
+        log_ret = np.diff(np.log(close), axis=1)
+        rv_hist = np.std(sliding_window_view(log_ret, RV_WINDOW, axis=1), axis=2, ddof=1) * np.sqrt(TRADING_DAYS)
+        realized_vol = rv_hist[:, -1]
+        rv_min = np.nanmin(rv_hist, axis=1)
+        rv_max = np.nanmax(rv_hist, axis=1)
+        iv_rank = (realized_vol - rv_min) / (rv_max - rv_min)
+
+        prev_close = close[:, :-1]
+        true_range = np.fmax(
+            high[:, 1:] - low[:, 1:],
+            np.fmax(np.abs(high[:, 1:] - prev_close), np.abs(low[:, 1:] - prev_close)),
+        )
+        atr_pct = true_range[:, -ATR_WINDOW:].mean(axis=1) / last
+
+        range_low = low[:, -RANGE_WINDOW:].min(axis=1)
+        range_high = high[:, -RANGE_WINDOW:].max(axis=1)
+        range_position = (last - range_low) / (range_high - range_low)
+        support_dist = last / range_low - 1
+
+    return {
+        "realized_vol": realized_vol,
+        "atr_pct": atr_pct,
+        "range_position": range_position,
+        "support_dist": support_dist,
+        "iv_rank": iv_rank,
+    }
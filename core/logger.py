@@ -1,11 +1,30 @@
 import os, json
 from datetime import datetime
+from logging.logger_setup import current_account
 
-def log_trades(trades):
-    """Dump the list of trade-dicts to logs/trades_<YYYYMMDD_HHMMSS>.json."""
-    os.makedirs("logs", exist_ok=True)
+# Optional core.export.Exporter that receives every logged trade and run summary.
+_exporter = None
+
+def set_exporter(exporter):
+    global _exporter
+    _exporter = exporter
+
+def export_record(kind, record):
+    """Queue a record for export (no-op unless an exporter is set), tagged with the current account."""
+    if _exporter is None:
+        return
+    account = current_account.get()
+    if account:
+        record = dict(record, account=account)
+    _exporter.enqueue(kind, record)
+
+def log_trades(trades, log_dir="logs"):
+    """Dump the list of trade-dicts to <log_dir>/trades_<YYYYMMDD_HHMMSS>.json and queue them for export."""
+    os.makedirs(log_dir, exist_ok=True)
     ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    path = f"logs/trades_{ts}.json"
+    path = f"{log_dir}/trades_{ts}.json"
     with open(path, "w") as f:
         json.dump(trades, f, indent=2)
     print(f"[logger] saved trades to {path}")
+    for trade in trades:
+        export_record("trade", trade)
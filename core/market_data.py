@@ -0,0 +1,88 @@
+import logging
+import threading
+import datetime
+from datetime import timedelta
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(f"strategy.{__name__}")
+
+
+class MarketDataCache:
+    """
+    Run-scoped, thread-safe cache of market data shared by several accounts.
+
+    Every request only fetches the keys that are not cached yet, so N accounts asking for the
+    same quotes, chains and snapshots cost a single pass against the data API.  Option chains
+    are fetched once over the widest expiration window of all profiles and narrowed per caller.
+    """
+
+    def __init__(self, client, min_dte, max_dte):
+        self.client = client
+        self.min_dte = min_dte
+        self.max_dte = max_dte
+        self._lock = threading.Lock()
+        self._trades = {}
+        self._contracts = {}
+        self._snapshots = {}
+        self._bars = {}
+
+    def get_stock_latest_trade(self, symbols):
+        symbols = [symbols] if isinstance(symbols, str) else list(symbols)
+        with self._lock:
+            missing = [s for s in symbols if s not in self._trades]
+            if missing:
+                logger.debug(f"Fetching latest trades for {len(missing)} symbols")
+                resp = self.client.get_stock_latest_trade(missing)
+                for s in missing:
+                    self._trades[s] = resp.get(s)
+            return {s: self._trades[s] for s in symbols if self._trades[s] is not None}
+
+    def get_daily_bars(self, symbols, lookback_days):
+        with self._lock:
+            missing = [s for s in symbols if (s, lookback_days) not in self._bars]
+            if missing:
+                bars = self.client.get_daily_bars(missing, lookback_days)
+                for s in missing:
+                    self._bars[(s, lookback_days)] = bars.get(s)
+            return {s: self._bars[(s, lookback_days)] for s in symbols if self._bars[(s, lookback_days)] is not None}
+
+    def get_options_contracts(self, underlying_symbols, contract_type=None, min_dte=None, max_dte=None):
+        min_dte = self.min_dte if min_dte is None else min_dte
+        max_dte = self.max_dte if max_dte is None else max_dte
+        if min_dte < self.min_dte or max_dte > self.max_dte:
+            raise ValueError(
+                f"Expiration window {min_dte}-{max_dte} is outside the cached window {self.min_dte}-{self.max_dte}."
+            )
+
+        with self._lock:
+            missing = [s for s in underlying_symbols if (s, contract_type) not in self._contracts]
+            if missing:
+                logger.debug(f"Fetching {contract_type or 'all'} option contracts for {len(missing)} symbols")
+                contracts = self.client.get_options_contracts(missing, contract_type, self.min_dte, self.max_dte)
+                for s in missing:
+                    self._contracts[(s, contract_type)] = []
+                for c in contracts:
+                    self._contracts.setdefault((c.underlying_symbol, contract_type), []).append(c)
+            cached = [c for s in underlying_symbols for c in self._contracts[(s, contract_type)]]
+
+        today = datetime.datetime.now(ZoneInfo("America/New_York")).date()
+        min_expiration = today + timedelta(days=min_dte)
+        max_expiration = today + timedelta(days=max_dte)
+        return [c for c in cached if min_expiration <= c.expiration_date <= max_expiration]
+
+    def get_option_snapshot(self, symbol):
+        if isinstance(symbol, str):
+            symbols = [symbol]
+        elif isinstance(symbol, list):
+            symbols = symbol
+        else:
+            raise ValueError("Symbol must be a string or list of symbols.")
+
+        with self._lock:
+            missing = [s for s in symbols if s not in self._snapshots]
+            if missing:
+                logger.debug(f"Fetching {len(missing)} option snapshots")
+                result = self.client.get_option_snapshot(missing)
+                for s in missing:
+                    self._snapshots[s] = result.get(s)
+            return {s: self._snapshots[s] for s in symbols if self._snapshots[s] is not None}
@@ -0,0 +1,236 @@
+import logging
+import datetime
+from zoneinfo import ZoneInfo
+from dataclasses import dataclass, field, fields
+import numpy as np
+from alpaca.trading.enums import AssetClass
+from config import params as default_params
+from .utils import parse_option_symbol, option_expiration
+
+logger = logging.getLogger(f"strategy.{__name__}")
+
+STOCK, CALL, PUT = 0, 1, 2
+
+RISK_FREE_RATE = 0.04
+# Used when a snapshot has no implied volatility.
+DEFAULT_IV = 0.40
+# Shock grid: relative move of every underlying x absolute change in implied volatility.
+PRICE_SHOCKS = np.array([-0.30, -0.20, -0.10, -0.05, 0.0, 0.05, 0.10])
+VOL_SHOCKS = np.array([-0.10, 0.0, 0.10, 0.20])
+
+
+def norm_cdf(x):
+    """
+    Standard normal CDF for arrays (Abramowitz & Stegun 7.1.26, |error| < 1.5e-7).
+    """
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def norm_pdf(x):
+    return np.exp(-0.5 * x * x) / np.sqrt(2.0 * np.pi)
+
+
+def black_scholes(kind, spot, strike, t, vol, r=RISK_FREE_RATE):
+    """
+    Vectorized Black-Scholes value, delta, gamma and theta (per day) for stocks, calls and puts.
+    All arguments broadcast; stock rows are valued at `spot` with delta 1.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sqrt_t = np.sqrt(t)
+        d1 = (np.log(spot / strike) + (r + 0.5 * vol ** 2) * t) / (vol * sqrt_t)
+        d2 = d1 - vol * sqrt_t
+        disc = strike * np.exp(-r * t)
+        pdf = norm_pdf(d1)
+        is_call = kind == CALL
+
+        value = np.where(is_call, spot * norm_cdf(d1) - disc * norm_cdf(d2), disc * norm_cdf(-d2) - spot * norm_cdf(-d1))
+        delta = np.where(is_call, norm_cdf(d1), norm_cdf(d1) - 1.0)
+        gamma = pdf / (spot * vol * sqrt_t)
+        decay = -spot * pdf * vol / (2 * sqrt_t)
+        theta = np.where(is_call, decay - r * disc * norm_cdf(d2), decay + r * disc * norm_cdf(-d2)) / 365
+
+    is_stock = kind == STOCK
+    return (
+        np.where(is_stock, spot, value),
+        np.where(is_stock, 1.0, delta),
+        np.where(is_stock, 0.0, gamma),
+        np.where(is_stock, 0.0, theta),
+    )
+
+
+@dataclass
+class PositionArrays:
+    """
+    Column arrays describing the portfolio, one row per position.
+    """
+    symbol: np.ndarray
+    underlying: np.ndarray
+    kind: np.ndarray
+    qty: np.ndarray         # signed: shares for stock, contracts for options
+    multiplier: np.ndarray
+    strike: np.ndarray
+    t: np.ndarray           # years to expiration
+    spot: np.ndarray        # live underlying price
+    entry_price: np.ndarray
+    iv: np.ndarray
+    delta: np.ndarray       # snapshot greeks, NaN where missing
+    gamma: np.ndarray
+    theta: np.ndarray
+
+    @classmethod
+    def from_positions(cls, positions, stock_prices, snapshots, today=None) -> "PositionArrays":
+        """
+        Build the arrays from `get_all_positions` output, a dict of underlying -> last price
+        and a dict of option symbol -> OptionsSnapshot.
+        """
+        today = today or datetime.datetime.now(ZoneInfo("America/New_York")).date()
+        rows = []
+        for p in positions:
+            qty = float(p.qty)
+            if p.asset_class == AssetClass.US_EQUITY:
+                price = stock_prices.get(p.symbol, float(p.current_price or p.avg_entry_price))
+                rows.append((p.symbol, p.symbol, STOCK, qty, 1.0, np.nan, np.nan, price,
+                             float(p.avg_entry_price), np.nan, 1.0, 0.0, 0.0))
+            elif p.asset_class == AssetClass.US_OPTION:
+                underlying, option_type, strike = parse_option_symbol(p.symbol)
+                dte = (option_expiration(p.symbol) - today).days
+                snap = snapshots.get(p.symbol)
+                greeks = getattr(snap, 'greeks', None)
+                iv = getattr(snap, 'implied_volatility', None)
+                rows.append((
+                    p.symbol, underlying, CALL if option_type == 'C' else PUT, qty, 100.0, strike,
+                    max(dte, 0.25) / 365, stock_prices.get(underlying, np.nan), float(p.avg_entry_price),
+                    iv if iv else np.nan,
+                    greeks.delta if greeks else np.nan,
+                    greeks.gamma if greeks else np.nan,
+                    greeks.theta if greeks else np.nan,
+                ))
+
+        cols = list(zip(*rows)) if rows else [()] * 13
+        return cls(
+            symbol=np.array(cols[0], dtype=object),
+            underlying=np.array(cols[1], dtype=object),
+            kind=np.array(cols[2], dtype=int),
+            **{name: np.array(col, dtype=float) for name, col in zip(
+                ["qty", "multiplier", "strike", "t", "spot", "entry_price", "iv", "delta", "gamma", "theta"], cols[3:]
+            )},
+        )
+
+    def select(self, mask) -> "PositionArrays":
+        """
+        Return the rows where `mask` is true.
+        """
+        return PositionArrays(**{f.name: getattr(self, f.name)[mask] for f in fields(self)})
+
+
+@dataclass
+class RiskReport:
+    net_delta: float            # share-equivalent delta
+    dollar_delta: float
+    net_gamma: float            # change in share-equivalent delta per $1 move
+    net_theta: float            # $ per day
+    price_shocks: np.ndarray
+    vol_shocks: np.ndarray
+    scenario_pnl: np.ndarray    # (price shocks x vol shocks) portfolio P&L in $
+    stop_loss: list = field(default_factory=list)
+    max_loss_breached: bool = False
+
+    @property
+    def worst_loss(self):
+        return float(-self.scenario_pnl.min()) if self.scenario_pnl.size else 0.0
+
+    def to_dict(self):
+        return {
+            "net_delta": self.net_delta,
+            "dollar_delta": self.dollar_delta,
+            "net_gamma": self.net_gamma,
+            "net_theta": self.net_theta,
+            "price_shocks": self.price_shocks.tolist(),
+            "vol_shocks": self.vol_shocks.tolist(),
+            "scenario_pnl": self.scenario_pnl.round(2).tolist(),
+            "worst_loss": self.worst_loss,
+            "stop_loss": self.stop_loss,
+            "max_loss_breached": self.max_loss_breached,
+        }
+
+
+def evaluate_risk(pos, params=default_params, price_shocks=PRICE_SHOCKS, vol_shocks=VOL_SHOCKS):
+    """
+    Compute greek exposures, the shock-grid P&L of every position at once, and the stop-loss / max-loss rules.
+    """
+    # Stock rows may fall back to their entry price.  An option's entry price is its premium, not the
+    # underlying's price, so option rows take the price of a matching stock position or are left out.
+    is_stock = pos.kind == STOCK
+    spot = np.where(np.isnan(pos.spot) & is_stock, pos.entry_price, pos.spot)
+    missing = np.isnan(spot)
+    if missing.any():
+        stock_spot = dict(zip(pos.underlying[is_stock], spot[is_stock]))
+        spot[missing] = [stock_spot.get(u, np.nan) for u in pos.underlying[missing]]
+        missing = np.isnan(spot)
+        if missing.any():
+            logger.warning(f"No underlying price for {', '.join(pos.symbol[missing])}; leaving them out of the risk grid")
+            pos, spot = pos.select(~missing), spot[~missing]
+
+    iv = np.where(np.isnan(pos.iv), DEFAULT_IV, pos.iv)
+    value, bs_delta, bs_gamma, bs_theta = black_scholes(pos.kind, spot, pos.strike, pos.t, iv)
+
+    # Prefer the snapshot greeks; fall back to the model where they are missing
+    delta = np.where(np.isnan(pos.delta), bs_delta, pos.delta)
+    gamma = np.where(np.isnan(pos.gamma), bs_gamma, pos.gamma)
+    theta = np.where(np.isnan(pos.theta), bs_theta, pos.theta)
+    size = pos.qty * pos.multiplier
+
+    # Reprice every position on the (position x price shock x vol shock) grid
+    shocked, _, _, _ = black_scholes(
+        pos.kind[:, None, None],
+        spot[:, None, None] * (1 + price_shocks[None, :, None]),
+        pos.strike[:, None, None],
+        pos.t[:, None, None],
+        np.maximum(iv[:, None, None] + vol_shocks[None, None, :], 0.01),
+    )
+    scenario_pnl = np.einsum("p,psv->sv", size, shocked - value[:, None, None])
+
+    stop_loss = []
+    if params.STOP_LOSS_PCT is not None:
+        drawdown = 1 - spot / pos.entry_price
+        hit = (pos.kind == STOCK) & (pos.qty > 0) & (drawdown >= params.STOP_LOSS_PCT)
+        stop_loss = pos.symbol[hit].tolist()
+
+    report = RiskReport(
+        net_delta=float(np.sum(size * delta)),
+        dollar_delta=float(np.sum(size * delta * spot)),
+        net_gamma=float(np.sum(size * gamma)),
+        net_theta=float(np.sum(size * theta)),
+        price_shocks=price_shocks,
+        vol_shocks=vol_shocks,
+        scenario_pnl=scenario_pnl,
+        stop_loss=stop_loss,
+    )
+    report.max_loss_breached = params.MAX_SCENARIO_LOSS is not None and report.worst_loss > params.MAX_SCENARIO_LOSS
+    return report
+
+
+def assess_risk(client, positions, params=default_params, today=None):
+    """
+    Fetch live quotes for `positions` and evaluate the portfolio risk.
+    """
+    underlyings = sorted({
+        p.symbol if p.asset_class == AssetClass.US_EQUITY else parse_option_symbol(p.symbol)[0] for p in positions
+    })
+    option_symbols = [p.symbol for p in positions if p.asset_class == AssetClass.US_OPTION]
+
+    trades = client.get_stock_latest_trade(underlyings) if underlyings else {}
+    snapshots = client.get_option_snapshot(option_symbols) if option_symbols else {}
+    stock_prices = {s: float(t.price) for s, t in trades.items()}
+
+    pos = PositionArrays.from_positions(positions, stock_prices, snapshots, today)
+    report = evaluate_risk(pos, params)
+    logger.info(
+        f"[Risk: delta {report.net_delta:.1f} sh (${report.dollar_delta:,.0f}), gamma {report.net_gamma:.2f}, "
+        f"theta ${report.net_theta:.2f}/day, worst shock loss ${report.worst_loss:,.0f}]"
+    )
+    return report
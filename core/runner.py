@@ -0,0 +1,170 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import params as default_params
+from .broker_client import BrokerClient
+from .execution import sell_puts, sell_calls, close_stop_losses
+from .risk import assess_risk
+from .logger import export_record
+from .utils import get_ny_timestamp
+from .market_data import MarketDataCache
+from .state_manager import update_state, calculate_risk
+from logging.strategy_logger import StrategyLogger
+from logging.logger_setup import current_account, add_account_log_file
+
+logger = logging.getLogger(f"strategy.{__name__}")
+
+
+def run_wheel(client, symbols, strat_logger, fresh_start=False, params=default_params, log_dir="logs",
+              chain_archive=None):
+    """
+    Turn the wheel once for a single account: sell covered calls on assigned stock, then sell puts.
+    """
+    strat_logger.set_fresh_start(fresh_start)
+    report = None
+
+    # Fetch your actual cash balance (not margin buying power)
+    # Fetch your Alpaca account details
+    account = client.trade_client.get_account()
+    # Cash balance and options buying power
+    cash_balance = float(account.cash)
+    options_bp = float(getattr(account, 'options_buying_power', 0))
+    logger.info(f"[Cash balance: ${cash_balance}, Options buying power: ${options_bp}]")
+
+    if fresh_start:
+        logger.info("Running in fresh start mode — liquidating all positions.")
+        client.liquidate_all_positions()
+        allowed_symbols = symbols
+        # On fresh start, limit by both cash and options buying power
+        buying_power = min(cash_balance, options_bp)
+    else:
+        # Track existing positions
+        positions = client.get_positions()
+        strat_logger.add_current_positions(positions)
+
+        # Calculate current deployed risk in cash-equivalent terms
+        current_risk = calculate_risk(positions)
+
+        # Update state and potentially sell covered calls
+        states = update_state(positions)
+        strat_logger.add_state_dict(states)
+
+        # Evaluate greeks, shock-grid losses and stop-loss rules before taking on new risk.
+        # The risk rules are optional: skip the extra quote pass when they are off, and keep trading if it fails.
+        stopped = []
+        if params.STOP_LOSS_PCT is not None or params.MAX_SCENARIO_LOSS is not None:
+            try:
+                report = assess_risk(client, positions, params)
+            except Exception as exc:
+                logger.exception(f"Risk evaluation failed, continuing without risk rules: {exc}")
+        if report:
+            strat_logger.add_risk_report(report.to_dict())
+            stopped = close_stop_losses(client, report.stop_loss, states, log_dir)
+
+        for symbol, state in states.items():
+            if state["type"] == "long_shares" and symbol not in stopped:
+                sell_calls(client, symbol, state["price"], state["qty"], strat_logger, params, log_dir)
+
+        # Determine which symbols are available for new puts
+        allowed_symbols = list(set(symbols) - set(states.keys()))
+        # Limit by free cash after risk and by options buying power
+        buying_power = min(cash_balance - current_risk, options_bp)
+
+        if report and report.max_loss_breached:
+            logger.warning(
+                f"[Worst shock-grid loss ${report.worst_loss:,.0f} exceeds MAX_SCENARIO_LOSS; not selling new puts]"
+            )
+            buying_power = 0
+
+    strat_logger.set_buying_power(buying_power)
+    strat_logger.set_allowed_symbols(allowed_symbols)
+
+    logger.info(f"[Effective buying power is ${buying_power}]")
+    sell_puts(client, allowed_symbols, buying_power, strat_logger, params, log_dir, chain_archive)
+
+    export_record("run_summary", {
+        "timestamp": get_ny_timestamp(),
+        "fresh_start": fresh_start,
+        "cash_balance": cash_balance,
+        "options_buying_power": options_bp,
+        "buying_power": buying_power,
+        "allowed_symbols": sorted(allowed_symbols),
+        "risk": report.to_dict() if report else None,
+    })
+
+    # Persist any strategy logs
+    strat_logger.save()
+
+
+def watch_risk(client, interval=60, params=default_params, log_dir="logs"):
+    """
+    Re-evaluate portfolio risk every `interval` seconds while the market is open and act on stop-losses.
+    """
+    while True:
+        try:
+            if client.trade_client.get_clock().is_open:
+                positions = client.get_positions()
+                states = update_state(positions)
+                report = assess_risk(client, positions, params)
+                close_stop_losses(client, report.stop_loss, states, log_dir)
+                if report.max_loss_breached:
+                    logger.warning(f"[Worst shock-grid loss ${report.worst_loss:,.0f} exceeds MAX_SCENARIO_LOSS]")
+        except Exception as exc:
+            # A transient API or network error must not stop the watcher
+            logger.exception(f"Risk check failed, retrying in {interval}s: {exc}")
+        time.sleep(interval)
+
+
+def run_accounts(profiles, fresh_start=False, strat_log=False, log_dir="logs", transport=None, chain_archive=None):
+    """
+    Run the wheel for several accounts concurrently on top of one shared market-data cache.
+
+    Each account gets its own trading client and writes its trades, strategy log and runtime
+    log under <log_dir>/<account name>/.  All clients share `transport` when given, and chains
+    seen by any account are recorded once to `chain_archive`.
+    Returns a dict of account name -> exception (or None).
+    """
+    if not profiles:
+        return {}
+
+    # Market data is requested with the first account's keys over the widest expiration window.
+    data_profile = profiles[0]
+    market_data = MarketDataCache(
+        BrokerClient(
+            api_key=data_profile.api_key, secret_key=data_profile.secret_key, paper=data_profile.paper, transport=transport
+        ),
+        min_dte=min(p.params.EXPIRATION_MIN for p in profiles),
+        max_dte=max(p.params.EXPIRATION_MAX for p in profiles),
+    )
+
+    root_logger = logging.getLogger("strategy")
+    handlers = [
+        add_account_log_file(root_logger, p.name, f"{log_dir}/{p.name}/run.log") for p in profiles
+    ]
+
+    def run_one(profile):
+        current_account.set(profile.name)
+        account_dir = f"{log_dir}/{profile.name}"
+        try:
+            client = BrokerClient(
+                api_key=profile.api_key, secret_key=profile.secret_key, paper=profile.paper,
+                market_data=market_data, transport=transport
+            )
+            strat_logger = StrategyLogger(enabled=strat_log, log_path=f"{account_dir}/strategy_log.json")
+            run_wheel(client, profile.symbols, strat_logger, fresh_start, profile.params, account_dir, chain_archive)
+        except Exception as exc:
+            logger.exception(f"Account {profile.name} failed: {exc}")
+            return exc
+        finally:
+            current_account.set(None)
+        return None
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(profiles)) as pool:
+            results = list(pool.map(run_one, profiles))
+    finally:
+        for h in handlers:
+            root_logger.removeHandler(h)
+            h.close()
+
+    return {p.name: r for p, r in zip(profiles, results)}
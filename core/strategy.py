@@ -1,27 +1,65 @@
-from config.params import DELTA_MIN, DELTA_MAX, YIELD_MIN, YIELD_MAX, OPEN_INTEREST_MIN, SCORE_MIN
+import logging
+import numpy as np
+from config import params as default_params
+from .indicators import underlying_metrics
 
-def filter_underlying(client, symbols, buying_power_limit):
+logger = logging.getLogger(f"strategy.{__name__}")
+
+def filter_underlying(client, symbols, buying_power_limit, params=default_params):
     """
-    Filter underlying symbols based on buying power.  Can add custom logic such as volatility or ranging / support metrics.
+    Filter underlying symbols based on buying power, then on volatility and ranging / support metrics
+    computed from cached daily bars (see `screen_underlying`).
     """
     resp = client.get_stock_latest_trade(symbols)
 
     filtered_symbols = [symbol for symbol in resp if 100*resp[symbol].price <= buying_power_limit]
 
+    if params.PRESCREEN and filtered_symbols:
+        # The pre-screen only narrows the list; on any failure keep the buying-power filter result
+        try:
+            bars = client.get_daily_bars(filtered_symbols, params.BAR_LOOKBACK_DAYS)
+            metrics = underlying_metrics(filtered_symbols, bars)
+            keep = screen_underlying(metrics, params)
+        except Exception as exc:
+            logger.exception(f"Pre-screen failed, keeping all {len(filtered_symbols)} symbols: {exc}")
+            return filtered_symbols
+
+        for i, symbol in enumerate(filtered_symbols):
+            if not keep[i]:
+                logger.info(
+                    f"Pre-screen dropped {symbol}: "
+                    + ", ".join(f"{k}={v[i]:.3f}" for k, v in metrics.items())
+                )
+        filtered_symbols = [symbol for symbol, passed in zip(filtered_symbols, keep) if passed]
+
     return filtered_symbols
 
-def filter_options(options, min_strike = 0):
+def screen_underlying(metrics, params=default_params):
+    """
+    Return a boolean mask of the symbols whose volatility, ATR, range and IV-rank proxy metrics are within limits.
+    NaN metrics (not enough history) never reject a symbol.
+    """
+    with np.errstate(invalid="ignore"):
+        reject = ((metrics["realized_vol"] < params.REALIZED_VOL_MIN)
+                  | (metrics["realized_vol"] > params.REALIZED_VOL_MAX)
+                  | (metrics["atr_pct"] > params.ATR_PCT_MAX)
+                  | (metrics["range_position"] < params.RANGE_POSITION_MIN)
+                  | (metrics["iv_rank"] < params.IV_RANK_MIN))
+    return ~reject
+
+def filter_options(options, min_strike = 0, params=default_params):
     """
     Filter put options based on delta and open interest.
+    `params` is any object exposing the `config.params` constants (e.g. a profile's overrides).
     """
     filtered_contracts = [contract for contract in options 
                           if contract.delta 
-                          and abs(contract.delta) > DELTA_MIN 
-                          and abs(contract.delta) < DELTA_MAX
-                          and (contract.bid_price / contract.strike) * (365 / (contract.dte + 1)) > YIELD_MIN
-                          and (contract.bid_price / contract.strike) * (365 / (contract.dte + 1)) < YIELD_MAX
+                          and abs(contract.delta) > params.DELTA_MIN 
+                          and abs(contract.delta) < params.DELTA_MAX
+                          and (contract.bid_price / contract.strike) * (365 / (contract.dte + 1)) > params.YIELD_MIN
+                          and (contract.bid_price / contract.strike) * (365 / (contract.dte + 1)) < params.YIELD_MAX
                           and contract.oi 
-                          and contract.oi > OPEN_INTEREST_MIN
+                          and contract.oi > params.OPEN_INTEREST_MIN
                           and contract.strike >= min_strike]
     
     return filtered_contracts
@@ -34,12 +72,12 @@ def score_options(options):
     scores = [(1 - abs(p.delta)) * (250 / (p.dte + 5)) * (p.bid_price / p.strike) for p in options]
     return scores
 
-def select_options(options, scores, n=None):
+def select_options(options, scores, n=None, params=default_params):
     """
     Select the top n options, keeping only the highest-scoring option per underlying symbol.
     """
     # Filter out low scores
-    filtered = [(option, score) for option, score in zip(options, scores) if score > SCORE_MIN]
+    filtered = [(option, score) for option, score in zip(options, scores) if score > params.SCORE_MIN]
 
     # Pick the best option per underlying
     best_per_underlying = {}
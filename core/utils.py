@@ -20,6 +20,18 @@ def parse_option_symbol(symbol):
     else:
         raise ValueError(f"Invalid option symbol format: {symbol}")
 
+def option_expiration(symbol):
+    """
+    Returns the expiration date encoded in an OCC-style option symbol.
+
+    Example:
+        'AAPL250516P00207500' -> date(2025, 5, 16)
+    """
+    match = re.match(r'^[A-Za-z]+(\d{6})[PC]\d{8}$', symbol)
+    if not match:
+        raise ValueError(f"Invalid option symbol format: {symbol}")
+    return datetime.strptime(match.group(1), "%y%m%d").date()
+
 def get_ny_timestamp():
     ny_tz = pytz.timezone("America/New_York")
     ny_time = datetime.now(ny_tz)
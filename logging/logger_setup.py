@@ -1,8 +1,26 @@
 import logging
 import sys
+import contextvars
 from pathlib import Path
 
-def setup_logger(log_file="logs/run.log", level="INFO", to_file=False):
+# Name of the account whose run is executing in the current thread (multi-account mode).
+current_account = contextvars.ContextVar("current_account", default=None)
+
+
+class AccountFilter(logging.Filter):
+    """
+    Tag records with the current account and, if `account` is given, only pass that account's records.
+    """
+    def __init__(self, account=None):
+        super().__init__()
+        self.account = account
+
+    def filter(self, record):
+        record.account = current_account.get() or "-"
+        return self.account is None or record.account == self.account
+
+
+def setup_logger(log_file="logs/run.log", level="INFO", to_file=False, multi_account=False):
     logger = logging.getLogger("strategy")
     logger.setLevel(getattr(logging, level.upper()))
 
@@ -10,7 +28,11 @@ def setup_logger(log_file="logs/run.log", level="INFO", to_file=False):
         # Console output
         ch = logging.StreamHandler(sys.stdout)
         ch.setLevel(getattr(logging, level.upper()))
-        ch.setFormatter(logging.Formatter("[%(message)s]"))
+        if multi_account:
+            ch.addFilter(AccountFilter())
+            ch.setFormatter(logging.Formatter("[%(account)s] [%(message)s]"))
+        else:
+            ch.setFormatter(logging.Formatter("[%(message)s]"))
         logger.addHandler(ch)
 
         # File output
@@ -24,3 +46,18 @@ def setup_logger(log_file="logs/run.log", level="INFO", to_file=False):
             logger.addHandler(fh)
 
     return logger
+
+
+def add_account_log_file(logger, account, log_file):
+    """
+    Write the records emitted while running `account` to their own log file.
+    """
+    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+    fh = logging.FileHandler(log_file)
+    fh.setLevel(logging.DEBUG)
+    fh.addFilter(AccountFilter(account))
+    fh.setFormatter(logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    ))
+    logger.addHandler(fh)
+    return fh
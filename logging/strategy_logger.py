@@ -37,6 +37,10 @@ class StrategyLogger:
         if self.enabled:
             self.log_entry["state_dict"] = state_dict
 
+    def add_risk_report(self, report: dict):
+        if self.enabled:
+            self.log_entry["risk"] = report
+
     def set_buying_power(self, buying_power: float):
         if self.enabled:
             self.log_entry["buying_power"] = buying_power
@@ -0,0 +1,75 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+import config.credentials  # noqa: F401  (loads .env so *_env lookups below see it)
+from config import params as default_params
+import json
+import os
+
+ROOT_DIR = Path(__file__).parent.parent
+DEFAULT_SYMBOLS_FILE = ROOT_DIR / "config" / "symbol_list.txt"
+PARAM_NAMES = [name for name in vars(default_params) if name.isupper()]
+
+
+def load_symbols(path=DEFAULT_SYMBOLS_FILE):
+    with open(path, 'r') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+@dataclass
+class Profile:
+    """
+    One account / parameter set run by the multi-account orchestrator.
+    """
+    name: str
+    api_key: str = field(repr=False)
+    secret_key: str = field(repr=False)
+    paper: bool = True
+    symbols: list = field(default_factory=list)
+    params: SimpleNamespace = field(default_factory=lambda: SimpleNamespace(
+        **{name: getattr(default_params, name) for name in PARAM_NAMES}
+    ))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Profile":
+        """
+        Build a profile from one entry of an accounts file.  Credentials are read from the
+        environment variables named by `api_key_env` / `secret_key_env` so no secrets live in the file,
+        and `params` overrides any constant from `config/params.py`.
+        """
+        name = data["name"]
+        api_key = os.getenv(data.get("api_key_env", "ALPACA_API_KEY"))
+        secret_key = os.getenv(data.get("secret_key_env", "ALPACA_SECRET_KEY"))
+        if not api_key or not secret_key:
+            raise ValueError(f"Missing API credentials for account {name}.")
+
+        overrides = data.get("params", {})
+        unknown = set(overrides) - set(PARAM_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown params for account {name}: {sorted(unknown)}")
+        params = {n: getattr(default_params, n) for n in PARAM_NAMES}
+        params.update(overrides)
+
+        if "symbols" in data:
+            symbols = list(data["symbols"])
+        else:
+            symbols = load_symbols(ROOT_DIR / data.get("symbols_file", DEFAULT_SYMBOLS_FILE))
+
+        return cls(
+            name=name,
+            api_key=api_key,
+            secret_key=secret_key,
+            paper=data.get("paper", True),
+            symbols=symbols,
+            params=SimpleNamespace(**params),
+        )
+
+    @staticmethod
+    def load_from_json(filepath: str) -> list["Profile"]:
+        with open(filepath, "r") as f:
+            payload = json.load(f)
+        profiles = [Profile.from_dict(d) for d in payload]
+        names = [p.name for p in profiles]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Account names must be unique: {names}")
+        return profiles
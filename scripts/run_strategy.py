@@ -1,8 +1,12 @@
-from pathlib import Path
+import sys
 from core.broker_client import BrokerClient
-from core.execution import sell_puts, sell_calls
-from core.state_manager import update_state, calculate_risk
+from core.http_transport import HTTPTransport
+from core.chain_archive import ChainArchive
+from core.export import Exporter, make_sink
+from core.logger import set_exporter
+from core.runner import run_wheel, run_accounts, watch_risk
 from config.credentials import ALPACA_API_KEY, ALPACA_SECRET_KEY, IS_PAPER
+from models.profile import Profile, load_symbols
 from logging.strategy_logger import StrategyLogger
 from logging.logger_setup import setup_logger
 from core.cli_args import parse_args
@@ -10,64 +14,79 @@ from core.cli_args import parse_args
 
 def main():
     args = parse_args()
-    
-    # Initialize loggers
+    logger = setup_logger(level=args.log_level, to_file=args.log_to_file, multi_account=bool(args.accounts))
+
+    # One pooled keep-alive session for every Alpaca client in this process
+    transport = HTTPTransport(pool_size=args.http_pool_size)
+    chain_archive = ChainArchive() if args.record_chains else None
+
+    # Trades and run summaries go to a local outbox and are sent in the background
+    exporter = None
+    if args.export_to:
+        sinks = {}
+        for spec in args.export_to:
+            # A misconfigured sink must not stop trading; skip it and keep going
+            try:
+                sink = make_sink(spec)
+            except ValueError as exc:
+                logger.warning(f"Skipping export sink {spec!r}: {exc}")
+                continue
+            if sink.key in sinks:
+                logger.warning(f"Skipping duplicate export sink {spec!r}")
+                continue
+            sinks[sink.key] = sink
+        if sinks:
+            exporter = Exporter(list(sinks.values())).start()
+            set_exporter(exporter)
+
+    try:
+        run(args, transport, chain_archive)
+    finally:
+        if chain_archive:
+            try:
+                chain_archive.flush()
+            except Exception as exc:
+                logger.exception(f"Failed to write archived option chains: {exc}")
+        if exporter:
+            exporter.close()
+        transport.close()
+
+
+def run(args, transport, chain_archive):
+    """
+    Run the mode selected on the command line: multi-account, risk watch, or a single wheel turn.
+    """
+    if args.accounts:
+        # Multi-account mode: one shared market-data pass, one wheel per account
+        profiles = Profile.load_from_json(args.accounts)
+        results = run_accounts(
+            profiles, fresh_start=args.fresh_start, strat_log=args.strat_log, transport=transport,
+            chain_archive=chain_archive
+        )
+        transport.log_stats()
+        if any(results.values()):
+            sys.exit(1)
+        return
+
+    # Initialize strategy logger
     strat_logger = StrategyLogger(enabled=args.strat_log)
-    logger = setup_logger(level=args.log_level, to_file=args.log_to_file)
-
-    strat_logger.set_fresh_start(args.fresh_start)
 
     # Load symbols to trade
-    SYMBOLS_FILE = Path(__file__).parent.parent / "config" / "symbol_list.txt"
-    with open(SYMBOLS_FILE, 'r') as f:
-        SYMBOLS = [line.strip() for line in f if line.strip()]
+    SYMBOLS = load_symbols()
 
     # Initialize Alpaca client
-    client = BrokerClient(api_key=ALPACA_API_KEY, secret_key=ALPACA_SECRET_KEY, paper=IS_PAPER)
-
-    # Fetch your actual cash balance (not margin buying power)
-    # Fetch your Alpaca account details
-    account = client.trade_client.get_account()
-    # Cash balance and options buying power
-    cash_balance = float(account.cash)
-    options_bp = float(getattr(account, 'options_buying_power', 0))
-    logger.info(f"[Cash balance: ${cash_balance}, Options buying power: ${options_bp}]")
-
-    if args.fresh_start:
-        logger.info("Running in fresh start mode — liquidating all positions.")
-        client.liquidate_all_positions()
-        allowed_symbols = SYMBOLS
-        # On fresh start, limit by both cash and options buying power
-        buying_power = min(cash_balance, options_bp)
-    else:
-        # Track existing positions
-        positions = client.get_positions()
-        strat_logger.add_current_positions(positions)
-
-        # Calculate current deployed risk in cash-equivalent terms
-        current_risk = calculate_risk(positions)
-
-        # Update state and potentially sell covered calls
-        states = update_state(positions)
-        strat_logger.add_state_dict(states)
-
-        for symbol, state in states.items():
-            if state["type"] == "long_shares":
-                sell_calls(client, symbol, state["price"], state["qty"], strat_logger)
-
-        # Determine which symbols are available for new puts
-        allowed_symbols = list(set(SYMBOLS) - set(states.keys()))
-        # Limit by free cash after risk and by options buying power
-        buying_power = min(cash_balance - current_risk, options_bp)
+    client = BrokerClient(api_key=ALPACA_API_KEY, secret_key=ALPACA_SECRET_KEY, paper=IS_PAPER, transport=transport)
 
-    strat_logger.set_buying_power(buying_power)
-    strat_logger.set_allowed_symbols(allowed_symbols)
+    if args.risk_watch is not None:
+        try:
+            watch_risk(client, args.risk_watch)
+        except KeyboardInterrupt:
+            pass
+        return
 
-    logger.info(f"[Effective buying power is ${buying_power}]")
-    sell_puts(client, allowed_symbols, buying_power, strat_logger)
+    run_wheel(client, SYMBOLS, strat_logger, fresh_start=args.fresh_start, chain_archive=chain_archive)
 
-    # Persist any strategy logs
-    strat_logger.save()
+    transport.log_stats()
 
 
 if __name__ == "__main__":